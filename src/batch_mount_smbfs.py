@@ -1,6 +1,7 @@
 import argparse
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 logging.basicConfig(
@@ -10,6 +11,9 @@ logging.basicConfig(
 )
 
 MOUNT_POINT = "/Users/thom/Desktop/remote-filesystem"
+MOUNT_ROOT = Path(MOUNT_POINT)
+# Special characters in drive names and their percent-encoded values
+PERCENT_ENCODING_TABLE = str.maketrans({"#": "%23", "@": "%40", ".": "%2E", " ": "%20"})
 
 
 def replace_special_characters(drive_name: str) -> str:
@@ -26,10 +30,7 @@ def replace_special_characters(drive_name: str) -> str:
     str
         The encoded drive name.
     """
-    replacements = {"#": "%23", "@": "%40", ".": "%2E", " ": "%20"}
-    for char, encoded_char in replacements.items():
-        drive_name = drive_name.replace(char, encoded_char)
-    return drive_name
+    return drive_name.translate(PERCENT_ENCODING_TABLE)
 
 
 def extract_drive_and_server(file_path: str) -> dict:
@@ -48,22 +49,71 @@ def extract_drive_and_server(file_path: str) -> dict:
         A dictionary mapping server names to their corresponding drive names.
     """
     drives = {}
-    with open(file_path, "r") as file:
-        current_server = None
-        for line in file:
-            if line.startswith("#"):
-                current_server = line.strip("#").strip()
-            else:
-                parts = line.strip().split("/")
-                if len(parts) >= 2:
-                    drive_name = parts[6]
-                    drives[current_server] = drive_name
+    current_server = None
+    # The drive list is small but may live on a remote share, read it in one go.
+    for line in Path(file_path).read_text().splitlines():
+        # Strip once per line, blank lines are skipped.
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            current_server = line.strip("#").strip()
+        else:
+            # The drive name is the 7th component, no need to split the rest.
+            parts = line.split("/", 7)
+            if len(parts) > 6:
+                drive_name = parts[6]
+                drives[current_server] = drive_name
     return drives
 
 
-def mount_smbfs(
-    drives: dict, username: str, password: str, server: str = "", drive: str = ""
-) -> None:
+def mount_drive(server: str, drive_name: str, username: str) -> None:
+    """
+    Mount a single SMB drive to `MOUNT_POINT/server/drive_name`.
+
+    The password is not passed to `mount_smbfs` (it would show up in the process
+    list), it is read from the login Keychain instead. Connect to the server once in
+    Finder with "Remember this password in my keychain" to save it there.
+
+    Parameters
+    ----------
+    server
+        Server name of the drive.
+    drive_name
+        Drive name to be mounted.
+    username
+        Username for accessing the SMB drive.
+    """
+    mount_path = MOUNT_ROOT / server / drive_name
+    mount_path.mkdir(parents=True, exist_ok=True)
+    encoded_drive_name = replace_special_characters(drive_name)
+
+    logging.info(f"Connecting to server {server}...")
+
+    # Pass argv directly, there is no need to spawn a shell just to parse the command.
+    # `-N` fails instead of prompting for a password missing from the Keychain, the
+    # drives are mounted concurrently.
+    command = [
+        "mount_smbfs",
+        "-N",
+        "-f",
+        "0755",
+        "-d",
+        "0755",
+        f"//{username}@{server}/{encoded_drive_name}",
+        str(mount_path),
+    ]
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    if result.returncode == 0:
+        logging.info(f"Successfully connected to server {server}.")
+    else:
+        logging.error(
+            f"Failed to connect to server {server}. \n\tError: {result.stderr.decode('utf-8', errors='replace')}"
+        )
+
+
+def mount_smbfs(drives: dict, username: str, server: str = "", drive: str = "") -> None:
     """
     Mount SMB drives based on the provided drive and server information.
 
@@ -73,8 +123,6 @@ def mount_smbfs(
         A dictionary mapping server names to their corresponding drive names.
     username
         Username for accessing the SMB drives.
-    password
-        Password for accessing the SMB drives.
     server
         Server name (optional) to mount a specific drive.
     drive
@@ -82,40 +130,43 @@ def mount_smbfs(
     """
     if server and drive:
         if server.lower() in drives and drives[server] == drive.lower:
-            server_dir = Path(MOUNT_POINT) / server
-            (server_dir / drive).mkdir(parents=True, exist_ok=True)
-            encoded_drive_name = replace_special_characters(drive)
-
-            logging.info(f"Connecting to server {server}...")
-
-            command = f'mount_smbfs -f 0755 -d 0755 //{username}:{password}@{server}/{encoded_drive_name} "{server_dir / drive}"'
-            result = subprocess.run(command, shell=True, capture_output=True)
-
-            if result.returncode == 0:
-                logging.info(f"Successfully connected to server {server}.")
-            else:
-                logging.error(
-                    f"Failed to connect to server {server}. \n\tError: {result.stderr.decode('utf-8')}"
-                )
+            mount_drive(server, drive, username)
         else:
             logging.error("The specified server and drive combination does not exist.")
     else:
-        for server, drive_name in drives.items():
-            server_dir = Path(MOUNT_POINT) / server
-            (server_dir / drive_name).mkdir(parents=True, exist_ok=True)
-            encoded_drive_name = replace_special_characters(drive_name)
-
-            logging.info(f"Connecting to server {server}...")
+        # Mounting mostly waits on the network, so mount all the drives concurrently
+        # instead of one after another.
+        with ThreadPoolExecutor(max_workers=min(32, len(drives)) or 1) as executor:
+            futures = [
+                executor.submit(mount_drive, server, drive_name, username)
+                for server, drive_name in drives.items()
+            ]
+            for future in futures:
+                future.result()
+
+
+def umount_drive(server: str, drive_name: str) -> None:
+    """
+    Unmount a single SMB drive from `MOUNT_POINT/server/drive_name`.
 
-            command = f'mount_smbfs -f 0755 -d 0755 //{username}:{password}@{server}/{encoded_drive_name} "{server_dir / drive_name}"'
-            result = subprocess.run(command, shell=True, capture_output=True)
+    Parameters
+    ----------
+    server
+        Server name of the drive.
+    drive_name
+        Drive name to be unmounted.
+    """
+    command = ["umount", str(MOUNT_ROOT / server / drive_name)]
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
-            if result.returncode == 0:
-                logging.info(f"Successfully connected to server {server}.")
-            else:
-                logging.error(
-                    f"Failed to connect to server {server}. \n\tError: {result.stderr.decode('utf-8')}"
-                )
+    if result.returncode == 0:
+        logging.info(
+            f"Successfully unmounted drive {drive_name} from server {server}."
+        )
+    else:
+        logging.error(
+            f"Failed to unmount drive {drive_name} from server {server}. \n\tError: {result.stderr.decode('utf-8', errors='replace')}"
+        )
 
 
 def umount_smbfs(drives: dict) -> None:
@@ -127,19 +178,14 @@ def umount_smbfs(drives: dict) -> None:
     drives
         A dictionary mapping server names to their corresponding drive names.
     """
-    for server, drive_name in drives.items():
-        server_dir = Path(MOUNT_POINT) / server
-        command = f'umount "{server_dir / drive_name}"'
-        result = subprocess.run(command, shell=True, capture_output=True)
-
-        if result.returncode == 0:
-            logging.info(
-                f"Successfully unmounted drive {drive_name} from server {server}."
-            )
-        else:
-            logging.error(
-                f"Failed to unmount drive {drive_name} from server {server}. \n\tError: {result.stderr.decode('utf-8')}"
-            )
+    # Like mounting, unmount all the drives concurrently.
+    with ThreadPoolExecutor(max_workers=min(32, len(drives)) or 1) as executor:
+        futures = [
+            executor.submit(umount_drive, server, drive_name)
+            for server, drive_name in drives.items()
+        ]
+        for future in futures:
+            future.result()
 
 
 if __name__ == "__main__":
@@ -158,13 +204,6 @@ if __name__ == "__main__":
         help="Username for accessing the SMB drives.",
         required=True,
     )
-    parser.add_argument(
-        "-p",
-        "--password",
-        type=str,
-        help="Password for accessing the SMB drives.",
-        required=True,
-    )
     parser.add_argument(
         "-um",
         "--umount_all",
@@ -185,6 +224,6 @@ if __name__ == "__main__":
         umount_smbfs(drives)
     elif args.drive:
         server, drive = args.drive.split(":")
-        mount_smbfs(drives, args.username, args.password, server, drive)
+        mount_smbfs(drives, args.username, server, drive)
     else:
-        mount_smbfs(drives, args.username, args.password)
+        mount_smbfs(drives, args.username)
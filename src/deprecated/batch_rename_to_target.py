@@ -3,9 +3,13 @@ Really slow, don't use.
 """
 
 import argparse
-import shutil
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Max difference in seconds for two mtimes to be considered equal.
+MTIME_TOLERANCE = 2.0
+
 
 def is_hidden_file(filename):
     return (
@@ -15,27 +19,58 @@ def is_hidden_file(filename):
     )
 
 
-def rename_files(source_dir, target_dir):
-    source_dir = Path(source_dir)
-    target_dir = Path(target_dir)
-
-    for source_file in source_dir.glob("**/*"):
-        if source_file.is_file() and not is_hidden_file(source_file):
-            target_file = None
-            for file in target_dir.glob("**/*"):
-                if (
-                    file.is_file()
-                    and not is_hidden_file(file)
-                    and file.stat().st_size == source_file.stat().st_size
-                    and file.stat().st_mtime == source_file.stat().st_mtime
-                ):
-                    target_file = file
-                    break
-            if target_file:
-                new_filename = target_file.name
-                new_path = source_file.with_name(new_filename)
-                shutil.move(source_file, new_path)
+def walk_files(directory):
+    # DirEntry gets the file type from the directory read, so is_dir() / is_file()
+    # need no stat() call, unlike Path.glob(). On POSIX, entry.stat() is still a real
+    # stat() call (only cached afterwards).
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and not is_hidden_file(entry):
+                yield entry
+
+
+def build_target_index(target_dir, max_workers=32):
+    # Group the (mtime, name) of every target file by size, in walk order.
+    # On a remote mount every stat() is a network round trip, so run them on a thread
+    # pool. map() keeps the walk order.
+    entries = list(walk_files(target_dir))
+    index = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for entry, st in zip(entries, executor.map(os.DirEntry.stat, entries)):
+            index.setdefault(st.st_size, []).append((st.st_mtime, entry.name))
+    return index
+
 
+def rename_files(source_dir, target_dir, max_workers=32):
+    target_index = build_target_index(target_dir, max_workers)
+
+    # Collect the source files first, they get renamed while iterating.
+    for entry in list(walk_files(source_dir)):
+        st = entry.stat()
+        # FAT and SMB round mtime to 2 seconds, so compare it with a tolerance, and
+        # take the closest match (the exact one if there is one).
+        candidates = [
+            candidate
+            for candidate in target_index.get(st.st_size, ())
+            if abs(candidate[0] - st.st_mtime) < MTIME_TOLERANCE
+        ]
+        if not candidates:
+            continue
+        match = min(candidates, key=lambda candidate: abs(candidate[0] - st.st_mtime))
+        # Each target name is given to one source file only.
+        target_index[st.st_size].remove(match)
+
+        source_file = Path(entry.path)
+        new_path = source_file.with_name(match[1])
+        if new_path == source_file:
+            continue
+        if os.path.lexists(new_path):
+            print(f"Skipping {source_file}: {new_path} already exists.")
+            continue
+        # The new path is in the same directory, so this is always a plain rename.
+        os.replace(source_file, new_path)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -43,9 +78,16 @@ def main():
     )
     parser.add_argument("source_dir", type=str, help="Path to the source directory")
     parser.add_argument("target_dir", type=str, help="Path to the target directory")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=32,
+        help="Number of threads used to stat the target directory",
+    )
 
     args = parser.parse_args()
-    rename_files(args.source_dir, args.target_dir)
+    rename_files(args.source_dir, args.target_dir, args.workers)
 
 
 if __name__ == "__main__":
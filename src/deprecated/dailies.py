@@ -5,11 +5,18 @@ import logging
 import os
 import re
 import sys
-from typing import AnyStr, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import AnyStr, Iterable, Iterator
 
 from deprecated.resolve import BaseResolve
+from dri import Timeline
 
-INVALID_EXTENSION = ["DS_Store", "JPG", "JPEG", "SRT"]
+# Lowercase, compared against the lowercased extension of each file name.
+INVALID_EXTENSION = frozenset({"ds_store", "jpg", "jpeg", "srt"})
+# Name of the render preset for proxies, such as "Proxy H.265 1080p".
+PROXY_PRESET_PATTERN = re.compile(r"Proxy.*H\.265")
+# Frame rate of the timelines created for dailies.
+TIMELINE_FRAME_RATE = "25"
 
 # Set up logger
 log = logging.getLogger(__name__)
@@ -32,28 +39,35 @@ ch.setFormatter(formatter)
 log.addHandler(ch)
 
 
-def absolute_file_paths(path: str) -> list:
+def absolute_file_paths(path: str) -> Iterator[str]:
     """
-    Walk through the path, add the abs paths of all files under the given path
-    to a list, and return that list.
+    Walk through the path and yield the abs paths of all files under the given path,
+    except the ones with an extension in INVALID_EXTENSION.
 
     Parameters
     ----------
     path
         The input media path for parsing files under it.
 
-    Returns
-    -------
-    list
-        A list containing all the abs path (str) of files under input path.
+    Yields
+    ------
+    str
+        The abs path of a file under input path.
     """
-    absolute_file_path_list = []
-    for directory_path, _, filenames in os.walk(path):
-        for filename in filenames:
-            absolute_file_path_list.append(
-                os.path.abspath(os.path.join(directory_path, filename))
-            )
-    return absolute_file_path_list
+    # `os.scandir()` gives the file type from the directory read, and the entry
+    # paths are already absolute once the root is, no `abspath()` per file.
+    with os.scandir(os.path.abspath(path)) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Same as `os.walk()`, don't descend into symlinked directories.
+                if not entry.is_symlink():
+                    yield from absolute_file_paths(entry.path)
+            else:
+                # Filter on the entry name, before the full path is ever used.
+                name = entry.name
+                dot = name.rfind(".")
+                if dot < 0 or name[dot + 1 :].lower() not in INVALID_EXTENSION:
+                    yield entry.path
 
 
 def get_subfolders_name(source_media_full_path: list[str]) -> list[str]:
@@ -71,7 +85,27 @@ def get_subfolders_name(source_media_full_path: list[str]) -> list[str]:
     list
         A list containing the name of the folders under the given path.
     """
-    return [os.path.split(i)[1] for i in source_media_full_path]
+    return [os.path.basename(i) for i in source_media_full_path]
+
+
+def get_bin_name(path: str, media_parent_path: str) -> str:
+    """
+    Get the name of the bin a media path is imported into, which is the name of the
+    folder right under the media parent path.
+
+    Parameters
+    ----------
+    path
+        A media path under the media parent path.
+    media_parent_path
+        The input media path.
+
+    Returns
+    -------
+    str
+        The bin name, such as "A001" for "{media_parent_path}/A001/C001.mov".
+    """
+    return os.path.relpath(path, media_parent_path).split(os.sep, 1)[0]
 
 
 def get_sorted_path(path: str) -> list:
@@ -90,17 +124,12 @@ def get_sorted_path(path: str) -> list:
     list
         A list containing all abs paths that have been sorted.
     """
-    filename_and_fullpath_dict = {
-        os.path.basename(os.path.splitext(path)[0]): path
-        for path in absolute_file_paths(path)
-        if os.path.splitext(path)[-1].replace(".", "") not in INVALID_EXTENSION
-    }
-    filename_and_fullpath_keys = list(filename_and_fullpath_dict.keys())
-    filename_and_fullpath_keys.sort()
-    filename_and_fullpath_value = [
-        filename_and_fullpath_dict.get(i) for i in filename_and_fullpath_keys
-    ]
-    return filename_and_fullpath_value
+    # Sort by file name without extension. Files sharing a name are all kept, in
+    # walk order.
+    return sorted(
+        absolute_file_paths(path),
+        key=lambda abs_path: os.path.splitext(os.path.basename(abs_path))[0],
+    )
 
 
 class Proxy(BaseResolve):
@@ -127,17 +156,55 @@ class Proxy(BaseResolve):
         super().__init__()
         self.media_parent_path = input_path
         self.proxy_parent_path = output_path
+        # The _Timeline bin, cached by `create_bin()`.
+        self.timeline_bin = None
+        # All the bins under root folder except _Timeline, cached by
+        # `get_camera_bins()`.
+        self.camera_bins = None
+        # Existing timelines by their resolution ("{width}x{height}"), cached by
+        # `create_new_timeline()`.
+        self.existing_timeline_resolution = None
+        # Video clips grouped by resolution, cached by `get_clips_by_resolution()`.
+        self.clips_by_resolution = None
         # self.media_fullpath_list = self.media_storage.GetSubFolderList(
         #     self.media_parent_path
         # )
 
     def create_bin(self, subfolders_list: Iterable[AnyStr]) -> None:
-        """Create subfolder in the media pool root folder."""
-        for i in subfolders_list:
-            self.media_pool.AddSubFolder(self.root_folder, i)
+        """
+        Create subfolder in the media pool root folder. Bins that already exist are
+        skipped.
+        """
+        # List the existing bins once, the _Timeline bin is looked up in it too.
+        subfolder_dict = {
+            subfolder.GetName(): subfolder
+            for subfolder in self.root_folder.GetSubFolderList()
+        }
+        for i in [*subfolders_list, "_Timeline"]:
+            if i not in subfolder_dict:
+                subfolder_dict[i] = self.media_pool.AddSubFolder(self.root_folder, i)
+        # The names are known already, fill the `get_camera_bins()` cache here
+        # instead of listing and naming all the bins again.
+        self.timeline_bin = subfolder_dict.pop("_Timeline")
+        self.camera_bins = list(subfolder_dict.values())
+
+    def get_camera_bins(self) -> list:
+        """
+        Get all the subfolders under the root folder except the _Timeline bin. The
+        list is built on the first call and reused afterwards.
 
-        if not self.get_subfolder_by_name("_Timeline"):
-            return self.media_pool.AddSubFolder(self.root_folder, "_Timeline")
+        Returns
+        -------
+        list
+            A list containing the camera bins (Folder object).
+        """
+        if self.camera_bins is None:
+            self.camera_bins = [
+                subfolder
+                for subfolder in self.root_folder.GetSubFolderList()
+                if subfolder.GetName() != "_Timeline"
+            ]
+        return self.camera_bins
 
     def import_clip(self, one_by_one=False) -> None:
         """
@@ -146,47 +213,90 @@ class Proxy(BaseResolve):
 
         Filter out the files with suffix in the INVALID_EXTENSION list before
         importing. If one_by_one parameter is specified as True, then they will
-        be imported one by one, which is relatively slow.
+        be imported with `ImportMedia()` per file list of each bin, instead of
+        `AddItemListToMediaPool()` per camera folder.
 
         Parameters
         ----------
         one_by_one
-            If this parameter is specified a True, it will be imported one by
-            one, which is relatively slow.
+            If this parameter is specified a True, the files are imported with
+            `ImportMedia()`, one call per bin.
         """
-        media_parent_dir = os.path.basename(self.media_parent_path)
+        # New clips are coming, let `get_clips_by_resolution()` group them again.
+        self.clips_by_resolution = None
+        # List the bins once, instead of once per camera folder (or per clip) through
+        # `get_subfolder_by_name()`.
+        subfolder_dict = {
+            subfolder.GetName(): subfolder
+            for subfolder in self.root_folder.GetSubFolderList()
+        }
 
         if not one_by_one:
-            for cam_path in self.media_storage.GetSubFolderList(self.media_parent_path):
-                filename_and_fullpath_value = get_sorted_path(cam_path)
-                if sys.platform.startswith("win") or sys.platform.startswith("cygwin"):
-                    name = cam_path.split("\\")[
-                        cam_path.split("\\").index(media_parent_dir) + 1
-                    ]
-                    current_folder = self.get_subfolder_by_name(name)
-                else:
-                    current_folder = self.get_subfolder_by_name(
-                        f"{cam_path.split('/')[cam_path.split('/').index(media_parent_dir) + 1]}"
-                    )
-
+            # Drop duplicated paths (order preserved), importing the same
+            # footage twice is the slowest thing here.
+            cam_paths = list(
+                dict.fromkeys(
+                    self.media_storage.GetSubFolderList(self.media_parent_path)
+                )
+            )
+            # Walking the camera folders only touches the file system, so walk
+            # them concurrently. The Resolve API calls below stay on this thread.
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                sorted_paths = list(executor.map(get_sorted_path, cam_paths))
+            for cam_path, filename_and_fullpath_value in zip(cam_paths, sorted_paths):
+                current_folder = subfolder_dict.get(
+                    get_bin_name(cam_path, self.media_parent_path)
+                )
+
+                # Check the bin before switching to it, otherwise the clips would
+                # be imported into whatever bin is currently selected.
+                if not current_folder:
+                    log.debug(f"No bin in the media pool for {cam_path}, skipped.")
+                    continue
                 self.media_pool.SetCurrentFolder(current_folder)
                 self.media_storage.AddItemListToMediaPool(filename_and_fullpath_value)
         else:
+            # Group the files by bin (sorted order kept within each bin), then
+            # `ImportMedia()` takes the whole list of a bin in one call.
+            paths_by_bin_name: dict[str, list[str]] = {}
             for abs_media_path in get_sorted_path(self.media_parent_path):
-                if sys.platform.startswith("win") or sys.platform.startswith("cygwin"):
-                    name = abs_media_path.split("\\")[
-                        abs_media_path.split("\\").index(media_parent_dir) + 1
-                    ]
-                    current_folder = self.get_subfolder_by_name(name)
-                    self.media_pool.SetCurrentFolder(current_folder)
-                    self.media_pool.ImportMedia(abs_media_path)
-                else:
-                    name = abs_media_path.split("/")[
-                        abs_media_path.split("/").index(media_parent_dir) + 1
-                    ]
-                    current_folder = self.get_subfolder_by_name_recursively(name)
-                    self.media_pool.SetCurrentFolder(current_folder)
-                self.media_pool.ImportMedia(abs_media_path)
+                paths_by_bin_name.setdefault(
+                    get_bin_name(abs_media_path, self.media_parent_path), []
+                ).append(abs_media_path)
+            for bin_name, abs_media_paths in paths_by_bin_name.items():
+                current_folder = subfolder_dict.get(bin_name)
+                if not current_folder:
+                    log.debug(f"No bin in the media pool named {bin_name}, skipped.")
+                    continue
+                self.media_pool.SetCurrentFolder(current_folder)
+                self.media_pool.ImportMedia(abs_media_paths)
+
+    def get_clips_by_resolution(self) -> dict[str, list]:
+        """
+        Walk through the camera bins once and group the video clips by their
+        resolution. The result is built on the first call and reused afterwards.
+
+        Returns
+        -------
+        dict
+            A dictionary mapping every clip resolution (such as "1920x1080"), in
+            the order they first appear, to the list of video clips (MediaPoolItem)
+            of that resolution. Resolutions of non-video clips are kept as keys
+            with an empty list.
+        """
+        if self.clips_by_resolution is None:
+            self.clips_by_resolution = {}
+            for subfolder in self.get_camera_bins():
+                for clip in subfolder.GetClipList():
+                    # `GetClipProperty()` without argument returns all the
+                    # properties in one call.
+                    clip_property = clip.GetClipProperty()
+                    clips = self.clips_by_resolution.setdefault(
+                        clip_property["Resolution"], []
+                    )
+                    if clip_property["Type"] in ("Video", "Video + Audio"):
+                        clips.append(clip)
+        return self.clips_by_resolution
 
     def get_resolution(self) -> list[str]:
         """
@@ -195,23 +305,14 @@ class Proxy(BaseResolve):
         Returns
         -------
         list
-            A list containing all the resolution information.
+            A list containing all the resolution information, in the order they
+            first appear (the timelines are created in this order).
         """
-        all_clips_resolution = []
-        for subfolder in self.root_folder.GetSubFolderList():
-            # 排除 _Timeline bin
-            if subfolder.GetName() == "_Timeline":
-                break
-
-            for clip in subfolder.GetClipList():
-                all_clips_resolution.append(clip.GetClipProperty("Resolution"))
-            all_clips_resolution = list(dict.fromkeys(all_clips_resolution))
-
-        return all_clips_resolution
+        return list(self.get_clips_by_resolution())
 
     def create_and_change_timeline(
         self, timeline_name: str, width: int, height: int
-    ) -> bool:
+    ) -> Timeline | None:
         """
         Simply create empty timeline and change its resolution to inputs
         width and height. Used for `create_new_timeline()` function.
@@ -227,16 +328,26 @@ class Proxy(BaseResolve):
 
         Returns
         -------
-        bool
-            If `SetSetting()` is all right, it will return True, otherwise it
-            will be False.
+        Timeline | None
+            The new timeline if it is created and `SetSetting()` is all right,
+            otherwise None.
         """
-        self.media_pool.CreateEmptyTimeline(timeline_name)
-        current_timeline = self.project.GetCurrentTimeline()
-        current_timeline.SetSetting("useCustomSettings", "1")
-        current_timeline.SetSetting("timelineResolutionWidth", str(width))
-        current_timeline.SetSetting("timelineResolutionHeight", str(height))
-        return current_timeline.SetSetting("timelineFrameRate", str(25))
+        # `CreateEmptyTimeline()` returns the new timeline, no need to
+        # `GetCurrentTimeline()` again.
+        current_timeline = self.media_pool.CreateEmptyTimeline(timeline_name)
+        if not current_timeline:
+            return None
+        if not self.set_timeline_settings(
+            current_timeline,
+            {
+                "useCustomSettings": "1",
+                "timelineResolutionWidth": str(width),
+                "timelineResolutionHeight": str(height),
+                "timelineFrameRate": TIMELINE_FRAME_RATE,
+            },
+        ):
+            return None
+        return current_timeline
 
     def create_new_timeline(self, timeline_name: str, width: int, height: int) -> bool:
         """
@@ -256,44 +367,63 @@ class Proxy(BaseResolve):
         -------
         bool
         """
-        self.media_pool.SetCurrentFolder(
-            self.root_folder.GetSubFolderList()[-1]
-        )  # SetCurrentFolder to _Timeline bin to build the timeline there
-
-        if self.project.GetTimelineCount() == 0:
-            self.create_and_change_timeline(timeline_name, width, height)
+        if not self.timeline_bin:
+            self.timeline_bin = self.root_folder.GetSubFolderList()[-1]
+        # SetCurrentFolder to _Timeline bin to build the timeline there
+        self.media_pool.SetCurrentFolder(self.timeline_bin)
+
+        # Scan the existing timelines only on the first call, then keep the
+        # dict up to date with the timelines created here.
+        if self.existing_timeline_resolution is None:
+            self.existing_timeline_resolution = {}
+            for existing_timeline in self.get_all_timeline():
+                # One `GetSetting()` call returns all the settings as a dict.
+                settings = existing_timeline.GetSetting()
+                self.existing_timeline_resolution.setdefault(
+                    f"{settings['timelineResolutionWidth']}"
+                    f"x{settings['timelineResolutionHeight']}",
+                    existing_timeline,
+                )
+
+        resolution = f"{width}x{height}"
+        existing_timeline = self.existing_timeline_resolution.get(resolution)
+        if not existing_timeline:
+            new_timeline = self.create_and_change_timeline(timeline_name, width, height)
+            if not new_timeline:
+                return False
+            self.existing_timeline_resolution[resolution] = new_timeline
             return True
-
-        existing_timeline_resolution = []
-        for existing_timeline in self.get_all_timeline():
-            existing_timeline_resolution.append(
-                f"{existing_timeline.GetSetting('timelineResolutionWidth')}"
-                f"x{existing_timeline.GetSetting('timelineResolutionHeight')}"
-            )
-        if f"{str(width)}x{str(height)}" not in existing_timeline_resolution:
-            return self.create_and_change_timeline(timeline_name, width, height)
         else:
-            current_timeline = self.project.GetCurrentTimeline()
-            new_name = f"{current_timeline.GetName()}_{str(width)}x{str(height)}"
-            return current_timeline.SetName(new_name)
+            # Reuse the timeline of the same resolution (not whichever timeline
+            # happens to be current), add `timeline_name` to its name so
+            # `append_to_timeline()` can find it for these clips. A rerun finds
+            # the name already there, don't append it again.
+            if timeline_name in existing_timeline.GetName().split("_"):
+                return True
+            new_name = f"{existing_timeline.GetName()}_{timeline_name}"
+            return existing_timeline.SetName(new_name)
 
     def append_to_timeline(self) -> None:
         """Append to timeline"""
-        all_timeline_name = [timeline.GetName() for timeline in self.get_all_timeline()]
-        for subfolder in self.root_folder.GetSubFolderList():
-            for clip in subfolder.GetClipList():
-                if (
-                    clip.GetClipProperty("type") == "Video"
-                    or clip.GetClipProperty("type") == "Video + Audio"
-                ):
-                    clip_width = clip.GetClipProperty("Resolution").split("x")[0]
-                    clip_height = clip.GetClipProperty("Resolution").split("x")[1]
-                    for name in all_timeline_name:
-                        if f"{clip_width}x{clip_height}" in name:
-                            self.project.SetCurrentTimeline(
-                                self.get_timeline_by_name(name)
-                            )
-                            self.media_pool.AppendToTimeline(clip)
+        # Timelines are named after the clip resolution(s) they hold, such as
+        # "3840x2160" or "3840x2160_1920x1080" (see `create_new_timeline()`).
+        # Map every resolution in the names to its timeline once, so each group
+        # of clips is a dict lookup instead of a scan over all the timelines.
+        timeline_by_resolution = {
+            resolution: timeline
+            for timeline in self.get_all_timeline()
+            for resolution in timeline.GetName().split("_")
+        }
+        # Kept sequential on purpose: `AppendToTimeline()` appends to the project's
+        # current timeline, so each `SetCurrentTimeline()` + `AppendToTimeline()`
+        # pair would have to hold the same lock, threads can't overlap anything.
+        for resolution, clips in self.get_clips_by_resolution().items():
+            timeline = timeline_by_resolution.get(resolution)
+            if timeline and clips:
+                self.project.SetCurrentTimeline(timeline)
+                # `AppendToTimeline()` accepts a list of clips, append the whole
+                # group in one call.
+                self.media_pool.AppendToTimeline(clips)
 
     def add_render_job(self):
         """
@@ -305,21 +435,18 @@ class Proxy(BaseResolve):
             - Windows: ``%USERNAME%\\AppData\\Roaming\\Blackmagic Design\\DaVinci Resolve\\Support\\Resolve Disk Database\\Resolve Projects\\Settings``
             - macOS: ``/Users/{user_name}/Library/Application Support/Blackmagic Design/DaVinci Resolve/Resolve Disk Database/Resolve Projects/Settings``
         """
-        # Load H.265 preset.
+        # Load H.265 preset, and remember whether there is one at all.
+        preset_loaded = False
         for preset in self.project.GetRenderPresetList():
-            if re.search(r".*(Proxy).*(H\.265).*", preset):
+            if PROXY_PRESET_PATTERN.search(preset):
                 self.project.LoadRenderPreset(preset)
                 log.info("Successfully loaded H.265 render preset")
+                preset_loaded = True
                 break
-            else:
-                continue
 
         # If there is no valid preset, it will not pass the following checks.
         # The following operations will not be performed.
-        if any(
-            re.search(r".*(Proxy).*(H\.265).*", preset)
-            for preset in self.project.GetRenderPresetList()
-        ):
+        if preset_loaded:
             # Add all timelines to the render queue
             for timeline in self.get_all_timeline():
                 self.project.SetCurrentTimeline(timeline)
@@ -353,19 +480,21 @@ class Proxy(BaseResolve):
         there needs to be a mechanism to handle this.  # TODO
         """
         if self.project.SetSetting("colorScienceMode", "davinciYRGB"):
-            timeline_color_space = self.project.GetSetting("colorSpaceTimeline")
-            output_colorspace = self.project.GetSetting("colorSpaceOutput")
+            project_settings = self.project.GetSetting()
             log.info("Set Project Color Management to 'DaVinci YRGB'")
-            log.info(f"Timeline Color Space is '{timeline_color_space}'")
-            log.info(f"Output Color Space is '{output_colorspace}'")
+            log.info(
+                f"Timeline Color Space is '{project_settings['colorSpaceTimeline']}'"
+            )
+            log.info(f"Output Color Space is '{project_settings['colorSpaceOutput']}'")
             log.info("----------------")
 
         if self.project.SetSetting("colorSpaceTimeline", "Rec.709 Gamma 2.4"):
-            timeline_color_space = self.project.GetSetting("colorSpaceTimeline")
-            output_colorspace = self.project.GetSetting("colorSpaceOutput")
+            project_settings = self.project.GetSetting()
             log.info("Set Timeline Color Space to 'Rec.709 Gamma 2.4'")
-            log.info(f"Timeline Color Space is '{timeline_color_space}'")
-            log.info(f"Output Color Space is '{output_colorspace}'")
+            log.info(
+                f"Timeline Color Space is '{project_settings['colorSpaceTimeline']}'"
+            )
+            log.info(f"Output Color Space is '{project_settings['colorSpaceOutput']}'")
             log.info("----------------")
 
         if self.project.SetSetting("colorSpaceOutput", "Same as Timeline"):
@@ -399,17 +528,17 @@ def main():
     if len(sys.argv) == 1:
         parser.print_help()
 
-    media_parent_path = parser.parse_args().input
+    # Parse the arguments once.
+    args = parser.parse_args()
+    media_parent_path = args.input
 
     # Ensure that the output path exists.
-    if not os.path.exists(parser.parse_args().output):
-        log.debug(
-            f"{parser.parse_args().output} does not exist, program is terminated."
-        )
+    if not os.path.exists(args.output):
+        log.debug(f"{args.output} does not exist, program is terminated.")
         parser.print_help()
         sys.exit()
     else:
-        proxy_parent_path = parser.parse_args().output
+        proxy_parent_path = args.output
 
     # Initialize the proxy object.
     p = Proxy(media_parent_path, proxy_parent_path)
@@ -428,18 +557,17 @@ def main():
     for res in p.get_resolution():
         if "x" not in res:
             continue
+        # Parse once and compare as integers (comparing the strings would be
+        # lexicographic, e.g. "720" <= "1080" is False).
+        width, height = (int(i) for i in res.split("x"))
         # If any number in the resolution (such as "1920x1080") is less than or
         # equal to 1080, then the resolution of the newly created timeline will
         # not be divided by 2. It will still be created at the original
         # resolution.
-        if int(res.split("x")[1]) <= 1080 or int(res.split("x")[0]) <= 1080:
-            timeline_width: int = int(res.split("x")[0])
-            timeline_height: int = int(res.split("x")[1])
-            p.create_new_timeline(res, timeline_width, timeline_height)
+        if height <= 1080 or width <= 1080:
+            p.create_new_timeline(res, width, height)
         else:
-            timeline_width: int = int(int(res.split("x")[0]) / 2)
-            timeline_height: int = int(int(res.split("x")[1]) / 2)
-            p.create_new_timeline(res, timeline_width, timeline_height)
+            p.create_new_timeline(res, width // 2, height // 2)
 
     # Import footage to timeline
     p.append_to_timeline()
@@ -10,20 +10,71 @@ retained.
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Below this number of files, the dummy files are created without a thread pool.
+MIN_FILES_FOR_THREADS = 128
+
+
+def create_dummy_file(source_path, dummy_path, umask):
+    st = os.stat(source_path)
+    mode = st.st_mode & 0o777
+    # Work on the file descriptor, so the dummy path is only resolved once.
+    try:
+        fd = os.open(
+            dummy_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | os.O_CLOEXEC, mode
+        )
+    except FileExistsError:
+        # The dummy from a previous run may be read-only, don't open it for writing.
+        os.chmod(dummy_path, mode)
+        os.utime(dummy_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return
+    try:
+        # A new file gets its mode from `os.open()`, unless umask strips some bits.
+        if mode & umask:
+            os.fchmod(fd, mode)
+        # The dummy keeps the times of the source, which creation doesn't give.
+        os.utime(fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+    finally:
+        os.close(fd)
+
+
+def scan_dir(source_dir, dummy_dir, files):
+    # The entry type comes from the directory read, no stat() to tell files and
+    # directories apart.
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            # Plain concatenation, the parent is known to be a directory path.
+            dummy_path = dummy_dir + os.sep + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                os.makedirs(dummy_path, exist_ok=True)
+                scan_dir(entry.path, dummy_path, files)
+            elif entry.is_file():
+                files.append((entry.path, dummy_path))
+
 
 def create_dummy_folders(original_dir, dummy_dir):
-    for source_path in Path(original_dir).rglob("*"):
-        relative_path = source_path.relative_to(original_dir)
-        dummy_path = Path(dummy_dir, relative_path)
-        dummy_path.parent.mkdir(parents=True, exist_ok=True)
-
-        if source_path.is_file():
-            dummy_path.touch()
-            st = source_path.stat()
-            os.utime(dummy_path, (st.st_atime, st.st_mtime))
-            os.chmod(dummy_path, st.st_mode & 0o777)
+    # Create the directories first, then the files can be created in any order.
+    dummy_dir = os.fspath(dummy_dir)
+    os.makedirs(dummy_dir, exist_ok=True)
+    files = []
+    scan_dir(original_dir, dummy_dir, files)
+
+    # Read the umask once, there is no way to get it without setting it.
+    umask = os.umask(0)
+    os.umask(umask)
+
+    # Not worth starting threads for a handful of files.
+    if len(files) < MIN_FILES_FOR_THREADS:
+        for source_path, dummy_path in files:
+            create_dummy_file(source_path, dummy_path, umask)
+        return
+
+    # Creating the files is bound by syscall latency, not CPU, run them on threads.
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for _ in executor.map(lambda paths: create_dummy_file(*paths, umask), files):
+            pass
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ import os
 import re
 import sys
 
-from deprecated.dailies import Proxy, get_sorted_path
+from deprecated.dailies import Proxy, get_bin_name, get_sorted_path
 from deprecated.resolve import Resolve
 
 DROP_FRAME_FPS = [23.98, 29.97, 59.94, 119.88]
@@ -44,7 +44,7 @@ def absolute_file_paths(path: str) -> list:
     absolute_file_path_list = []
     for directory_path, _, filenames in os.walk(path):
         for filename in filenames:
-            if filename.split(".")[-1] != "DS_Store":
+            if filename.rpartition(".")[2] != "DS_Store":
                 absolute_file_path_list.append(
                     os.path.abspath(os.path.join(directory_path, filename))
                 )
@@ -66,7 +66,7 @@ def get_subfolders_name(path: list[str]) -> list[str]:
     list
         Containing subfolders name.
     """
-    return [os.path.split(i)[1] for i in path]
+    return [os.path.basename(i) for i in path]
 
 
 def is_camera_dir(text: str) -> bool:
@@ -143,20 +143,19 @@ class QC(Resolve):
         camera folder.
         """
         current_selected_bin = self.media_pool.GetCurrentFolder()
+        # List the existing bins once, then keep the set up to date, instead of
+        # listing them again for every bin to be created.
+        existing_subfolder_names = {
+            subfolder.GetName() for subfolder in current_selected_bin.GetSubFolderList()
+        }
 
-        for subfolder_name in subfolders_name_list:
+        for subfolder_name in [*subfolders_name_list, "Timeline"]:
             # If the bin to be created does not yet exist, create it, otherwise
             # skip it to avoid duplication.
-            if subfolder_name not in [
-                subfolder.GetName()
-                for subfolder in current_selected_bin.GetSubFolderList()
-            ]:
+            if subfolder_name not in existing_subfolder_names:
                 self.media_pool.AddSubFolder(current_selected_bin, subfolder_name)
+                existing_subfolder_names.add(subfolder_name)
 
-        if "Timeline" not in [
-            subfolder.GetName() for subfolder in current_selected_bin.GetSubFolderList()
-        ]:
-            self.media_pool.AddSubFolder(current_selected_bin, "Timeline")
         self.media_pool.SetCurrentFolder(current_selected_bin)
 
     def import_clip(self) -> None:
@@ -171,21 +170,13 @@ class QC(Resolve):
         Return a list of the `MediaPoolItem` created, if duplicate, return an
         empty list (`[]`).
         """
-        media_parent_dir = os.path.basename(self.media_parent_path)
         current_parent_folder = self.media_pool.GetCurrentFolder()
 
         for cam_path in self.media_storage.GetSubFolderList(self.media_parent_path):
             filename_and_fullpath_value = get_sorted_path(cam_path)
-            if sys.platform.startswith("win") or sys.platform.startswith("cygwin"):
-                bin_name = cam_path.split("\\")[
-                    cam_path.split("\\").index(media_parent_dir) + 1
-                ]
-                current_folder = self.get_subfolder_by_name_recursively(bin_name)
-            else:
-                bin_name = cam_path.split("/")[
-                    cam_path.split("/").index(media_parent_dir) + 1
-                ]
-                current_folder = self.get_subfolder_by_name_recursively(bin_name)
+            current_folder = self.get_subfolder_by_name_recursively(
+                get_bin_name(cam_path, self.media_parent_path)
+            )
             self.media_pool.SetCurrentFolder(current_folder)
             self.media_storage.AddItemListToMediaPool(filename_and_fullpath_value)
             self.media_pool.SetCurrentFolder(current_parent_folder)
@@ -201,41 +192,39 @@ class QC(Resolve):
 
         """
         parent_bin = self.media_pool.GetCurrentFolder()
+        parent_bin_name = parent_bin.GetName()
+        # Find the Timeline bin once, not once per resolution. The recursive
+        # lookup may change the current folder, so switch back to the parent bin.
+        timeline_bin = self.get_subfolder_by_name_recursively("Timeline")
+        self.media_pool.SetCurrentFolder(parent_bin)
+        existing_timeline_names = {
+            timeline.GetName() for timeline in self.proxy.get_all_timeline()
+        }
 
-        for subfolder in self.media_pool.GetCurrentFolder().GetSubFolderList():
+        for subfolder in parent_bin.GetSubFolderList():
+            subfolder_name = subfolder.GetName()
             # Skip the Timeline folder to avoid getting the res and fps
             # information under this folder, because there is no valid
             # res and fps information under this folder.
-            if subfolder.GetName() == "Timeline":
+            if subfolder_name == "Timeline":
                 continue
-            res_fps_dict = self.get_bin_res_and_fps(subfolder.GetName())
+            res_fps_dict = self.get_bin_res_and_fps(subfolder_name)
             for res, fps in res_fps_dict.items():
+                width, height = (int(i) for i in res.split("x"))
                 if fps in DROP_FRAME_FPS:
-                    timeline_name = (
-                        f"{parent_bin.GetName()}_{subfolder.GetName()}_{res}_{fps}p"
-                    )
-                    self.media_pool.SetCurrentFolder(
-                        self.get_subfolder_by_name_recursively("Timeline")
-                    )
-                    self.create_and_change_timeline(
-                        timeline_name,
-                        int(res.split("x")[0]),
-                        int(res.split("x")[1]),
-                        fps,
-                    )
-                    self.media_pool.SetCurrentFolder(parent_bin)
+                    timeline_name = f"{parent_bin_name}_{subfolder_name}_{res}_{fps}p"
                 else:
-                    timeline_name = f"{parent_bin.GetName()}_{subfolder.GetName()}_{res}_{int(fps)}p"
-                    self.media_pool.SetCurrentFolder(
-                        self.get_subfolder_by_name_recursively("Timeline")
-                    )
-                    self.create_and_change_timeline(
-                        timeline_name,
-                        int(res.split("x")[0]),
-                        int(res.split("x")[1]),
-                        int(fps),
-                    )
-                    self.media_pool.SetCurrentFolder(parent_bin)
+                    fps = int(fps)
+                    timeline_name = f"{parent_bin_name}_{subfolder_name}_{res}_{fps}p"
+
+                # Timeline names are unique, `CreateEmptyTimeline()` would fail
+                # anyway, skip the API calls when the script is run again.
+                if timeline_name in existing_timeline_names:
+                    continue
+                self.media_pool.SetCurrentFolder(timeline_bin)
+                self.create_and_change_timeline(timeline_name, width, height, fps)
+                self.media_pool.SetCurrentFolder(parent_bin)
+                existing_timeline_names.add(timeline_name)
 
     def get_bin_res_and_fps(self, bin_name: str) -> dict[str, float]:
         """
@@ -254,11 +243,14 @@ class QC(Resolve):
             camera bin in the media pool, used by `create_timeline_qc()`.
         """
         current_bin = self.get_subfolder_by_name_recursively(bin_name)
+        clip_properties = [
+            clip.GetClipProperty() for clip in current_bin.GetClipList()  # type: ignore
+        ]
         bin_res_fps_dict = {
-            clip.GetClipProperty("Resolution"): clip.GetClipProperty("FPS")
-            for clip in current_bin.GetClipList()  # type: ignore
+            clip_property["Resolution"]: clip_property["FPS"]
+            for clip_property in clip_properties
             # Exclude audio files since they do not have valid res info.
-            if clip.GetClipProperty("type") != "Audio"
+            if clip_property["Type"] != "Audio"
         }
 
         return bin_res_fps_dict
@@ -292,19 +284,17 @@ class QC(Resolve):
             If `SetSetting()` is all right, it will return True, otherwise it
             will be False.
         """
-        if isinstance(fps, float) and self.media_pool.CreateEmptyTimeline(
-            timeline_name
-        ):
-            current_timeline = self.project.GetCurrentTimeline()
-            current_timeline.SetSetting("useCustomSettings", "1")
-            current_timeline.SetSetting("timelineResolutionWidth", str(width))
-            current_timeline.SetSetting("timelineResolutionHeight", str(height))
+        # `CreateEmptyTimeline()` returns the new timeline, no need to
+        # `GetCurrentTimeline()` again.
+        current_timeline = self.media_pool.CreateEmptyTimeline(timeline_name)
+        if not current_timeline:
+            return
+        current_timeline.SetSetting("useCustomSettings", "1")
+        current_timeline.SetSetting("timelineResolutionWidth", str(width))
+        current_timeline.SetSetting("timelineResolutionHeight", str(height))
+        if isinstance(fps, float):
             current_timeline.SetSetting("timelineFrameRate", str(int(fps)))
-        elif self.media_pool.CreateEmptyTimeline(timeline_name):
-            current_timeline = self.project.GetCurrentTimeline()
-            current_timeline.SetSetting("useCustomSettings", "1")
-            current_timeline.SetSetting("timelineResolutionWidth", str(width))
-            current_timeline.SetSetting("timelineResolutionHeight", str(height))
+        else:
             current_timeline.SetSetting("timelineFrameRate", str(fps))
 
     def append_to_timeline(self):
@@ -319,63 +309,73 @@ class QC(Resolve):
         not be appended to that timeline to avoid duplication.
         """
         current_folder = self.media_pool.GetCurrentFolder()
+        current_folder_name = current_folder.GetName()
 
         # Get the timeline to which it should be appended based on the clip's
-        # properties.
+        # properties, and group the clips by timeline name.
+        clips_by_timeline_name: dict[str, list[tuple]] = {}
         for subfolder in current_folder.GetSubFolderList():
-            if subfolder.GetName() == "Timeline":
+            subfolder_name = subfolder.GetName()
+            if subfolder_name == "Timeline":
                 continue
             for clip in subfolder.GetClipList():
-                if (
-                    clip.GetClipProperty("type") == "Video"
-                    or clip.GetClipProperty("type") == "Video + Audio"
-                ):
-                    res = clip.GetClipProperty("Resolution")
-                    fps = clip.GetClipProperty("FPS")
+                clip_property = clip.GetClipProperty()
+                if clip_property["Type"] in ("Video", "Video + Audio"):
+                    res = clip_property["Resolution"]
+                    fps = clip_property["FPS"]
                     if fps in DROP_FRAME_FPS:
-                        current_timeline_name = f"{current_folder.GetName()}_{subfolder.GetName()}_{res}_{fps}p"
-                        current_timeline = self.get_timeline_by_name(
-                            current_timeline_name
-                        )
+                        current_timeline_name = f"{current_folder_name}_{subfolder_name}_{res}_{fps}p"
                     else:
-                        current_timeline_name = f"{current_folder.GetName()}_{subfolder.GetName()}_{res}_{int(fps)}p"
-                        current_timeline = self.get_timeline_by_name(
-                            current_timeline_name
-                        )
-
-                    # Duplication check
-                    clips_currently_on_timeline: list[str] = [
-                        timeline_clip.GetName()
-                        for timeline_clip in current_timeline.GetItemListInTrack(  # type: ignore
-                            "video", 1
-                        )
-                    ]
-                    if clip.GetName() in clips_currently_on_timeline:
-                        continue
-
-                    # The actual appending action
-                    if not self.project.SetCurrentTimeline(current_timeline):
-                        log.debug(
-                            f"append_to_timeline() project.SetCurrentTimeline()"
-                            f" failed. Current timeline is {current_timeline}."
-                        )
-                    self.media_pool.AppendToTimeline(clip)
-                    self.set_clip_colorspace(clip)
-
-    def set_clip_colorspace(self, clip):
+                        current_timeline_name = f"{current_folder_name}_{subfolder_name}_{res}_{int(fps)}p"
+                    # Keep the file path for `set_clip_colorspace()`.
+                    clips_by_timeline_name.setdefault(current_timeline_name, []).append(
+                        (clip, clip_property["File Path"])
+                    )
+
+        # List the timelines once, not once per timeline name.
+        timeline_dict = self.proxy.get_timeline_dict()
+        for current_timeline_name, clips in clips_by_timeline_name.items():
+            current_timeline = timeline_dict.get(current_timeline_name)
+            if not current_timeline:
+                log.debug(f"No timeline named {current_timeline_name}, skipped.")
+                continue
+
+            # Duplication check, against the clips already on the timeline and
+            # the ones appended in this batch.
+            clips_currently_on_timeline: set[str] = {
+                timeline_clip.GetName()
+                for timeline_clip in current_timeline.GetItemListInTrack(  # type: ignore
+                    "video", 1
+                )
+            }
+            clips_to_append = []
+            for clip, clip_path in clips:
+                clip_name = clip.GetName()
+                if clip_name not in clips_currently_on_timeline:
+                    clips_currently_on_timeline.add(clip_name)
+                    clips_to_append.append((clip, clip_path))
+            if not clips_to_append:
+                continue
+
+            # The actual appending action, one `AppendToTimeline()` call per
+            # timeline.
+            if not self.project.SetCurrentTimeline(current_timeline):
+                log.debug(
+                    f"append_to_timeline() project.SetCurrentTimeline()"
+                    f" failed. Current timeline is {current_timeline}."
+                )
+            self.media_pool.AppendToTimeline([clip for clip, _ in clips_to_append])
+            for clip, clip_path in clips_to_append:
+                self.set_clip_colorspace(clip, clip_path)
+
+    def set_clip_colorspace(self, clip, clip_path: str = ""):
         # By looking at which folder this clip comes from, we can compare it
         # with the `camera_log_dict` in QC attribute to get its color space
-        # information.
-        clip_path = clip.GetClipProperty("File Path")
-        if sys.platform.startswith("win") or sys.platform.startswith("cygwin"):
-            cam_name = clip_path.split("\\")[
-                clip_path.split("\\").index(os.path.basename(self.media_parent_path))
-                + 1
-            ].split("#")[0]
-        else:
-            cam_name = clip_path.split("/")[
-                clip_path.split("/").index(os.path.basename(self.media_parent_path)) + 1
-            ].split("#")[0]
+        # information. Pass `clip_path` if it is known already to save a
+        # `GetClipProperty()` call.
+        if not clip_path:
+            clip_path = clip.GetClipProperty("File Path")
+        cam_name = get_bin_name(clip_path, self.media_parent_path).split("#")[0]
         camera_log_key = list(self.camera_log_dict.keys())
         camera_log_val = list(self.camera_log_dict.values())
         try:
@@ -409,7 +409,6 @@ class QC(Resolve):
         self.project.SetSetting("colorSpaceInput", "Rec.709 Gamma 2.4")
         self.project.SetSetting("colorSpaceOutput", "Rec.709 Gamma 2.4")
         self.project.SetSetting("timelineWorkingLuminanceMode", "SDR 100")
-        self.project.SetSetting("timelineWorkingLuminanceMode", "SDR 100")
         self.project.SetSetting("inputDRT", "DaVinci")
         self.project.SetSetting("outputDRT", "DaVinci")
         self.project.SetSetting("useCATransform", "1")
@@ -422,26 +421,15 @@ class QC(Resolve):
         Not working as expected so far: `SetCurrentFolder()` to parent too frequently.
         Don't use it.
         """
-        media_parent_dir = os.path.basename(self.media_parent_path)
         current_parent_folder = self.media_pool.GetCurrentFolder()
 
         for abs_media_path in get_sorted_path(self.media_parent_path):
-            if sys.platform.startswith("win") or sys.platform.startswith("cygwin"):
-                name = abs_media_path.split("\\")[
-                    abs_media_path.split("\\").index(media_parent_dir) + 1
-                ]
-                current_folder = self.get_subfolder_by_name_recursively(name)
-                self.media_pool.SetCurrentFolder(current_folder)
-                self.media_pool.ImportMedia(abs_media_path)
-                self.media_pool.SetCurrentFolder(current_parent_folder)
-            else:
-                name = abs_media_path.split("/")[
-                    abs_media_path.split("/").index(media_parent_dir) + 1
-                ]
-                current_folder = self.get_subfolder_by_name_recursively(name)
-                self.media_pool.SetCurrentFolder(current_folder)
-                self.media_pool.ImportMedia(abs_media_path)
-                self.media_pool.SetCurrentFolder(current_parent_folder)
+            current_folder = self.get_subfolder_by_name_recursively(
+                get_bin_name(abs_media_path, self.media_parent_path)
+            )
+            self.media_pool.SetCurrentFolder(current_folder)
+            self.media_pool.ImportMedia(abs_media_path)
+            self.media_pool.SetCurrentFolder(current_parent_folder)
 
 
 def main():
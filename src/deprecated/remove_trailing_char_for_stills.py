@@ -17,13 +17,8 @@ from dri import Resolve
 resolve = Resolve.resolve_init()
 project_manager = resolve.GetProjectManager()
 project = project_manager.GetCurrentProject()
-media_storage = resolve.GetMediaStorage()
-media_pool = project.GetMediaPool()
-root_folder = media_pool.GetRootFolder()
-current_timeline = project.GetCurrentTimeline()
 
 galley = project.GetGallery()
-current_gallery_still_ablum = galley.GetCurrentStillAlbum()
 
 for gallery_still_album in galley.GetGalleryStillAlbums():
     for still in gallery_still_album.GetStills():
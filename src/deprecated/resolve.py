@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from dri import Resolve
 from dri import Folder
 
@@ -7,19 +9,38 @@ class BaseResolve:
     Resolve class
 
     This class is used to initialize some necessary objects for the basic use of the
-    API.
+    API. Each object is fetched on first access and then reused, so a script only
+    pays for the API calls of the objects it actually uses.
     """
 
-    def __init__(self):
-        """Initialize some necessary objects."""
-        # self.resolve = dvr_script.scriptapp("Resolve")
-        self.resolve = Resolve.resolve_init()
-        self.project_manager = self.resolve.GetProjectManager()
-        self.project = self.project_manager.GetCurrentProject()
-        self.media_storage = self.resolve.GetMediaStorage()
-        self.media_pool = self.project.GetMediaPool()
-        self.root_folder = self.media_pool.GetRootFolder()
-        self.current_timeline = self.project.GetCurrentTimeline()
+    @cached_property
+    def resolve(self):
+        # return dvr_script.scriptapp("Resolve")
+        return Resolve.resolve_init()
+
+    @cached_property
+    def project_manager(self):
+        return self.resolve.GetProjectManager()
+
+    @cached_property
+    def project(self):
+        return self.project_manager.GetCurrentProject()
+
+    @cached_property
+    def media_storage(self):
+        return self.resolve.GetMediaStorage()
+
+    @cached_property
+    def media_pool(self):
+        return self.project.GetMediaPool()
+
+    @cached_property
+    def root_folder(self):
+        return self.media_pool.GetRootFolder()
+
+    @cached_property
+    def current_timeline(self):
+        return self.project.GetCurrentTimeline()
 
     def get_all_timeline(self) -> list:
         """
@@ -30,11 +51,35 @@ class BaseResolve:
             all_timeline.append(self.project.GetTimelineByIndex(timeline_index))
         return all_timeline
 
+    def get_timeline_dict(self) -> dict:
+        """
+        Get all existing timelines by name. Build it once when looking up several
+        timelines, instead of calling `get_timeline_by_name()` for each of them.
+        """
+        return {timeline.GetName(): timeline for timeline in self.get_all_timeline()}
+
     def get_timeline_by_name(self, timeline_name: str):
         """Get timeline object by name."""
-        all_timeline = self.get_all_timeline()
-        timeline_dict = {timeline.GetName(): timeline for timeline in all_timeline}
-        return timeline_dict.get(timeline_name)
+        return self.get_timeline_dict().get(timeline_name)
+
+    def set_timeline_settings(self, timeline, settings: dict[str, str]) -> bool:
+        """
+        Call `SetSetting()` on the timeline for each setting, in the order of the dict.
+
+        Parameters
+        ----------
+        timeline
+            The Timeline object to apply the settings to.
+        settings
+            A dictionary mapping setting names to their values.
+
+        Returns
+        -------
+        bool
+            True if every `SetSetting()` succeeded, otherwise False.
+        """
+        results = [timeline.SetSetting(key, value) for key, value in settings.items()]
+        return all(results)
 
     def get_subfolder_by_name(self, subfolder_name: str) -> Folder | str:
         """
@@ -72,19 +117,16 @@ class BaseResolve:
 
         subfolder_dict = {}
 
-        for subfolder in current_selected_folder.GetSubFolderList():
-            # If subfolder has child bins, its `GetSubFolderList()` method will
-            # return a list, otherwise it will return `[]` which is False. If it
-            # is True (means subfolder does have child bins), it will go to the
-            # next level of recursion until there is no child bin
-            # (`GetSubFolderList` return `[]`).
-            if subfolder.GetSubFolderList():
-                self.media_pool.SetCurrentFolder(subfolder)
-                subfolder_dict.setdefault(subfolder.GetName(), subfolder)
-                subfolder_dict = subfolder_dict | self.get_subfolder_recursively()
-            else:
+        def collect_subfolders(folder: Folder) -> None:
+            # Walk the folders directly instead of selecting each of them with
+            # `SetCurrentFolder()`, so the current folder is left untouched. A
+            # folder without child bins returns `[]` and ends the recursion, and
+            # the first folder seen with a given name is kept.
+            for subfolder in folder.GetSubFolderList():
                 subfolder_dict.setdefault(subfolder.GetName(), subfolder)
+                collect_subfolders(subfolder)
 
+        collect_subfolders(current_selected_folder)
         return subfolder_dict
 
     def get_subfolder_by_name_recursively(
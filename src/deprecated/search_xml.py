@@ -21,18 +21,23 @@ import csv
 from urllib.parse import unquote
 
 
-def parse_xml_to_csv(xml_file, output_csv, tag):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+def iter_tag_rows(xml_file, tag):
+    # Stream the XML instead of building the whole tree first, every element is
+    # cleared once it has been looked at.
+    for _, elem in ET.iterparse(xml_file, events=("end",)):
+        if elem.tag == tag:
+            text = elem.text or ""
+            # Most paths have nothing to unquote, skip the decoder for them.
+            yield elem.tag, unquote(text) if "%" in text else text
+        elem.clear()
+
 
+def parse_xml_to_csv(xml_file, output_csv, tag):
     with open(output_csv, "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["Tag", "Path"])
-
-        for elem in root.iter(tag):
-            tag_name = elem.tag
-            path = unquote(elem.text) if elem.text else ""
-            writer.writerow([tag_name, path])
+        # One `writerows()` call consumes the rows as they are parsed.
+        writer.writerows(iter_tag_rows(xml_file, tag))
 
 
 def main():
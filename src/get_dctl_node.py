@@ -4,39 +4,47 @@ from dri import Resolve
 from tabulate import tabulate
 
 
+def get_dctl_nodes(timeline_item) -> list[tuple[int, str]]:
+    """
+    Return the (node index, node label) of every node of a clip using DCTL, sorted
+    by node index.
+    """
+    node_graph = timeline_item.GetNodeGraph()
+    num_of_nodes = node_graph.GetNumNodes()
+
+    # Fetch the tools of all the nodes first, so the API calls of a clip happen
+    # back to back and the check below is plain Python.
+    tools_by_node = [
+        node_graph.GetToolsInNode(node_index) or ()
+        for node_index in range(1, num_of_nodes + 1)
+    ]
+
+    # Keep track of DCTL nodes for each clip
+    dctl_nodes = []
+
+    # Check each node for the presence of the "OFX: DCTL" tool
+    for node_index, tools_in_node in enumerate(tools_by_node, start=1):
+        if any("OFX: DCTL" in tool for tool in tools_in_node):
+            node_label = node_graph.GetNodeLabel(node_index)
+            dctl_nodes.append((node_index, node_label))
+
+    # Nodes are visited in index order, so the list is already sorted.
+    return dctl_nodes
+
+
 def check_clips_for_dctl():
     resolve = Resolve.resolve_init()
     project_manager = resolve.GetProjectManager()
     project = project_manager.GetCurrentProject()
-    media_storage = resolve.GetMediaStorage()
-    media_pool = project.GetMediaPool()
-    root_folder = media_pool.GetRootFolder()
     current_timeline = project.GetCurrentTimeline()
 
     clips_data = []
 
     # Iterate through each clip in the video track 1
     for i, timeline_item in enumerate(current_timeline.GetItemListInTrack("video", 1)):
-        node_graph = timeline_item.GetNodeGraph()
-        num_of_nodes = node_graph.GetNumNodes()
-
-        # Keep track of DCTL nodes for each clip
-        dctl_nodes = []
-
-        # Check each node for the presence of the "DCTL" tool
-        for node_index in range(1, num_of_nodes + 1):
-            tools_in_node = node_graph.GetToolsInNode(node_index)
-            if tools_in_node is None:
-                continue
-            # Check if "OFX: DCTL" tool is in the current node
-            if any("OFX: DCTL" in tool for tool in tools_in_node):
-                node_label = node_graph.GetNodeLabel(node_index)
-                dctl_nodes.append((node_index, node_label))
-
-        # Sort the DCTL nodes by node index
-        dctl_nodes.sort()
-
-        # Add the clip data with sorted DCTL nodes
+        dctl_nodes = get_dctl_nodes(timeline_item)
+
+        # Add the clip data with DCTL nodes
         if dctl_nodes:
             node_indices = [node_index for node_index, _ in dctl_nodes]
             node_labels = [node_label for _, node_label in dctl_nodes]
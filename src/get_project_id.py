@@ -8,20 +8,76 @@ Notice:
    manually. If not, script will start from the root folder.
 3. Legacy projects may encounter error (such like plugin non-available, DCTL missing,
    etc), user should notice and click the popup window to let it go.
+4. Retrieved IDs are cached in a JSON file (`--cache`, next to the CSV by default),
+   so projects seen in a previous run are not opened again. Use `--refresh` to ignore
+   the cache. A project deleted and imported again under the same name gets a new
+   ID, run with `--refresh` after that.
 """
 
 import argparse
 import csv
+import json
+import os
 import sys
 
 from dri import Resolve
 from tabulate import tabulate
 
 
-def fetch_project_data():
+def load_cache(filename):
+    """Load the cached project IDs, an empty dict if there is no cache yet."""
+    if not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable cache file {filename}: {e}")
+        return {}
+    if not isinstance(cache, dict):
+        print(f"Ignoring invalid cache file {filename}: not a JSON object")
+        return {}
+    return cache
+
+
+def save_cache(cache, filename):
+    """Save the project IDs for the next run."""
+    try:
+        with open(filename, mode="w", encoding="utf-8") as file:
+            json.dump(cache, file, indent=2)
+    except OSError as e:
+        print(f"Error writing cache file: {e}")
+
+
+def get_current_folder_path(project_manager):
+    """
+    Get the path of the current project manager folder, such as "/Client/Show".
+
+    `GetCurrentFolder()` only returns the folder name, so go up to the root folder
+    and back down again to the current folder.
+    """
+    folders = []
+    while True:
+        folder = project_manager.GetCurrentFolder()
+        if not project_manager.GotoParentFolder():
+            break
+        folders.append(folder)
+    folders.reverse()
+    for folder in folders:
+        project_manager.OpenFolder(folder)
+    return "/" + "/".join(folders)
+
+
+def fetch_project_data(cache=None, refresh=False):
     """
     Fetch project names and their unique IDs from DaVinci Resolve in the current folder.
+
+    Projects found in `cache` (keyed by "folder path/project name") are not loaded
+    again unless `refresh` is True, newly retrieved IDs are added to it.
     """
+    if cache is None:
+        cache = {}
+
     # Initialize Resolve and project manager
     resolve = Resolve.resolve_init()
     project_manager = resolve.GetProjectManager()
@@ -32,16 +88,25 @@ def fetch_project_data():
     if not project_list:
         raise ValueError("No projects found in the current folder.")
 
+    # Project names are only unique within a folder.
+    current_folder_path = get_current_folder_path(project_manager)
+
     # Initialize a list to store project details
     project_data = []
 
     # Loop through all projects in the folder
     for project_name in project_list:
+        cache_key = f"{current_folder_path.rstrip('/')}/{project_name}"
+        # The ID never changes, skip `LoadProject()` (the slow part) if it's known.
+        if not refresh and cache_key in cache:
+            project_data.append([project_name, cache[cache_key]])
+            continue
         try:
             project = project_manager.LoadProject(project_name)
             if project:
                 project_id = project.GetUniqueId()
                 project_data.append([project_name, project_id])
+                cache[cache_key] = project_id
                 project_manager.CloseProject(project)
             else:
                 project_data.append([project_name, "Project ID retrieval failed"])
@@ -79,12 +144,29 @@ def main():
         default="project_ids.csv",
         help="Specify the output CSV filename.",
     )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        help=(
+            "Specify the JSON file caching the project IDs between runs "
+            "(default: .project_id_cache.json next to the CSV file)."
+        ),
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the cached project IDs and open every project again.",
+    )
 
     args = parser.parse_args()
+    if args.cache is None:
+        args.cache = os.path.join(os.path.dirname(args.csv), ".project_id_cache.json")
 
     try:
         # Fetch project data from the current folder
-        project_data = fetch_project_data()
+        cache = load_cache(args.cache)
+        project_data = fetch_project_data(cache, args.refresh)
+        save_cache(cache, args.cache)
 
         # Print the data in a table format
         headers = ["Project Name", "Project ID"]
@@ -8,15 +8,15 @@ import argparse
 from dri import Resolve, TimelineItem
 from tabulate import tabulate
 
+# `versionType` of a remote grade version (0 is local).
+REMOTE_VERSION_TYPE = 1
+
 
 def main() -> None:
     # Initialize Resolve and get project-related objects
     resolve = Resolve.resolve_init()
     project_manager = resolve.GetProjectManager()
     project = project_manager.GetCurrentProject()
-    media_storage = resolve.GetMediaStorage()
-    media_pool = project.GetMediaPool()
-    root_folder = media_pool.GetRootFolder()
     current_timeline = project.GetCurrentTimeline()
 
     # Get list of clips in the timeline
@@ -24,14 +24,16 @@ def main() -> None:
         "video", 1
     )
 
-    # Collect clips data
-    clips_data = []
-    for i, clip in enumerate(clips_in_timeline):
-        current_version = clip.GetCurrentVersion()
-        if current_version.get("versionType") == 1:
-            clips_data.append(
-                [i + 1, clip.GetName(), current_version.get("versionName")]
-            )
+    # Collect clips data. `GetCurrentVersion()` is needed for every clip, but
+    # `GetName()` only for the ones using a remote version.
+    current_versions = [clip.GetCurrentVersion() for clip in clips_in_timeline]
+    clips_data = [
+        [i + 1, clip.GetName(), current_version.get("versionName")]
+        for i, (clip, current_version) in enumerate(
+            zip(clips_in_timeline, current_versions)
+        )
+        if current_version.get("versionType") == REMOTE_VERSION_TYPE
+    ]
 
     # Print the table
     if clips_data:
@@ -13,7 +13,7 @@ def remove_non_video_clips(folder):
     for clip in folder.GetClipList():
         clip_name = clip.GetName()
         clip_type = clip.GetClipProperty("Type")
-        is_timeline = clip.GetClipProperty("Type") == "Timeline"
+        is_timeline = clip_type == "Timeline"
 
         if (
             clip_type not in ("Video + Audio", "Video")
@@ -12,41 +12,53 @@ def convert_smpte_to_frames(timecode, fps):
 
 def get_blue_markers(timeline, start_frames):
     markers = timeline.GetMarkers()
+    start_frames = int(start_frames)
     blue_markers = {
-        frame + int(start_frames): info
+        frame + start_frames: info
         for frame, info in markers.items()
         if info["color"] == "Blue"
     }
     return blue_markers
 
 
-def get_clip_name_at_frame(timeline, frame):
-    clips = timeline.GetItemListInTrack("Video", 1)
-    for clip in clips:
-        if clip.GetStart() <= frame <= clip.GetEnd():
-            return clip.GetName()
+def get_clip_ranges(timeline):
+    # Fetch the start, end and name of every clip once, instead of listing the track
+    # and querying every clip again for each marker.
+    return [
+        (clip.GetStart(), clip.GetEnd(), clip.GetName())
+        for clip in timeline.GetItemListInTrack("Video", 1)
+    ]
+
+
+def get_clip_name_at_frame(clip_ranges, frame):
+    for start, end, name in clip_ranges:
+        if start <= frame <= end:
+            return name
     return "unknown_clip"
 
 
-def add_render_jobs(project, timeline, blue_markers, target_dir, render_preset):
+def add_render_jobs(project, timeline, blue_markers, target_dir):
     # Clear the render queue before adding new render jobs
     project.DeleteAllRenderJobs()
 
+    timeline_settings = timeline.GetSetting()
+    format_width = int(timeline_settings["timelineResolutionWidth"])
+    format_height = int(timeline_settings["timelineResolutionHeight"])
+
+    clip_ranges = get_clip_ranges(timeline)
+
     job_ids = []
     for frame in blue_markers:
-        clip_name = get_clip_name_at_frame(timeline, frame)
+        clip_name = get_clip_name_at_frame(clip_ranges, frame)
 
-        # TODO: move this check upstream, otherwise the render preset doesn't load on, but the timeline params are modified.
-        if not project.LoadRenderPreset(render_preset):
-            raise ValueError(
-                f"Failed to load render preset: {render_preset}. Is this render preset exist?"
-            )
+        # The render preset is loaded once by `main()`, each job only overrides
+        # the settings below.
         project.SetRenderSettings(
             {
                 "TargetDir": target_dir,
                 "CustomName": f"{clip_name}_",
-                "FormatWidth": int(timeline.GetSetting("timelineResolutionWidth")),
-                "FormatHeight": int(timeline.GetSetting("timelineResolutionHeight")),
+                "FormatWidth": format_width,
+                "FormatHeight": format_height,
                 "MarkIn": frame,
                 "MarkOut": frame,
             }
@@ -62,69 +74,85 @@ def main(target_dir, render_preset):
     project = project_manager.GetCurrentProject()
     current_timeline = project.GetCurrentTimeline()
 
+    # Load the render preset once, before any timeline setting is modified, so a
+    # missing preset leaves the timeline untouched.
+    if not project.LoadRenderPreset(render_preset):
+        raise ValueError(
+            f"Failed to load render preset: {render_preset}. Is this render preset exist?"
+        )
+
     start_frames = current_timeline.GetStartFrame()
     blue_markers = get_blue_markers(current_timeline, start_frames)
 
     # Remember current timeline settings
+    current_settings = current_timeline.GetSetting()
+    # A key missing from the dict (e.g. the DRT settings of older versions) is asked
+    # for on its own, so it's never restored as None.
     original_settings = {
-        "useCustomSettings": current_timeline.GetSetting("useCustomSettings"),
-        "colorScienceMode": current_timeline.GetSetting("colorScienceMode"),
-        "colorAcesODT": current_timeline.GetSetting("colorAcesODT"),
-        "colorAcesGamutCompressType": current_timeline.GetSetting(
-            "colorAcesGamutCompressType"
-        ),
-        "colorSpaceOutput": current_timeline.GetSetting("colorSpaceOutput"),
-        "colorSpaceOutputGamutLimit": current_timeline.GetSetting(
-            "colorSpaceOutputGamutLimit"
-        ),
-        "colorSpaceTimeline": current_timeline.GetSetting("colorSpaceTimeline"),
-        "inputDRT": current_timeline.GetSetting("inputDRT"),
-        "outputDRT": current_timeline.GetSetting("outputDRT"),
-        "useCATransform": current_timeline.GetSetting("useCATransform"),
+        key: (
+            current_settings[key]
+            if key in current_settings
+            else current_timeline.GetSetting(key)
+        )
+        for key in (
+            "useCustomSettings",
+            "colorScienceMode",
+            "colorAcesODT",
+            "colorAcesGamutCompressType",
+            "colorSpaceOutput",
+            "colorSpaceOutputGamutLimit",
+            "colorSpaceTimeline",
+            "inputDRT",
+            "outputDRT",
+            "useCATransform",
+        )
     }
 
     # Check if current timeline is under project level color management (it means `current_timeline.GetSetting("useCustomSettings") == "0"`).
     if original_settings["useCustomSettings"] == "0":
-        project_res_width = project.GetSetting("timelineResolutionWidth")
-        project_res_height = project.GetSetting("timelineResolutionHeight")
-        project_fps = project.GetSetting("timelineFrameRate")
+        project_settings = project.GetSetting()
+        project_res_width = project_settings["timelineResolutionWidth"]
+        project_res_height = project_settings["timelineResolutionHeight"]
+        project_fps = project_settings["timelineFrameRate"]
         current_timeline.SetSetting("useCustomSettings", "1")
         current_timeline.SetSetting("timelineResolutionWidth", project_res_width)
         current_timeline.SetSetting("timelineResolutionHeight", project_res_height)
         current_timeline.SetSetting("timelineFrameRate", project_fps)
 
     # Check if current timeline is color managed by ACES
-    if original_settings["colorScienceMode"] != "acescct":
+    is_aces = original_settings["colorScienceMode"] == "acescct"
+    if not is_aces:
         current_timeline.SetSetting("colorScienceMode", "acescct")
 
-    # Set additional settings for ACES
-    current_timeline.SetSetting("colorAcesODT", "No Output Transform")
-    current_timeline.SetSetting("colorAcesGamutCompressType", "None")
+    # Set additional settings for ACES. Skip the ones already set, which is only
+    # known if the timeline was ACES before (switching the mode may reset them).
+    if not is_aces or original_settings["colorAcesODT"] != "No Output Transform":
+        current_timeline.SetSetting("colorAcesODT", "No Output Transform")
+    if not is_aces or original_settings["colorAcesGamutCompressType"] != "None":
+        current_timeline.SetSetting("colorAcesGamutCompressType", "None")
 
-    job_ids = add_render_jobs(
-        project, current_timeline, blue_markers, target_dir, render_preset
-    )
+    job_ids = add_render_jobs(project, current_timeline, blue_markers, target_dir)
 
     if job_ids:
         project.StartRendering(job_ids)
-        while any(
-            project.GetRenderJobStatus(job_id)["JobStatus"] == "Rendering"
-            for job_id in job_ids
-        ):
+        # One call per poll, instead of querying the status of every job
+        while project.IsRenderingInProgress():
             time.sleep(1)  # Wait for rendering to complete
 
     # Restoring original timeline settings
-    for key, value in original_settings.items():
-        if original_settings["useCustomSettings"] == "0":
-            current_timeline.SetSetting("useCustomSettings", "0")
-            print(
-                'Restored original timeline color management settings (by simply toggle the button "Use Project Settings")'
-            )
-            break
-        if current_timeline.SetSetting(key, value):
-            print(f'Restored "{key}" to "{value}".')
-        else:
-            print(f'Failed to restore "{key}".')
+    if original_settings["useCustomSettings"] == "0":
+        current_timeline.SetSetting("useCustomSettings", "0")
+        print(
+            'Restored original timeline color management settings (by simply toggle the button "Use Project Settings")'
+        )
+    else:
+        for key, value in original_settings.items():
+            if value is None:
+                continue
+            if current_timeline.SetSetting(key, value):
+                print(f'Restored "{key}" to "{value}".')
+            else:
+                print(f'Failed to restore "{key}".')
 
 
 if __name__ == "__main__":
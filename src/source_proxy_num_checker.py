@@ -5,6 +5,7 @@ the proxy folder.
 
 import argparse
 import csv
+import os
 from pathlib import Path
 
 from tabulate import tabulate
@@ -27,9 +28,14 @@ def save_to_csv(data: list, filename: str) -> None:
 
 def get_filenames_with_paths(directory: str) -> dict[str, str]:
     filenames_with_paths = {}
-    for p in Path(directory).rglob("*"):
-        if p.suffix[1:].upper() in VALID_EXT and not p.name.startswith("._"):
-            filenames_with_paths[p.stem] = str(p.resolve())
+    # Resolve the root once and build the paths from plain strings, instead of a
+    # `Path` object and a `resolve()` (a syscall per path component) per file.
+    root = os.path.realpath(directory)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            stem, ext = os.path.splitext(filename)
+            if ext[1:].upper() in VALID_EXT and not filename.startswith("._"):
+                filenames_with_paths[stem] = os.path.join(dirpath, filename)
     return filenames_with_paths
 
 
@@ -37,8 +43,9 @@ def check_filenames_exist(source_dir: str, target_dir: str, to_csv=False) -> Non
     source_dict = get_filenames_with_paths(source_dir)
     target_dict = get_filenames_with_paths(target_dir)
 
-    missing_in_target = set(source_dict.keys()) - set(target_dict.keys())
-    missing_in_source = set(target_dict.keys()) - set(source_dict.keys())
+    # Dict key views support set operations directly, no need to copy them into sets
+    missing_in_target = source_dict.keys() - target_dict.keys()
+    missing_in_source = target_dict.keys() - source_dict.keys()
 
     if missing_in_target:
         missing_in_target_with_path = [(filename, source_dict[filename]) for filename in missing_in_target]  # fmt: off